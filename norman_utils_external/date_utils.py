@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List
 
 
 class DateUtils:
@@ -11,11 +12,80 @@ class DateUtils:
         if date_format is None:
             date_format = DateUtils.utc_format
 
+        # The known formats are composed directly from the datetime fields, which avoids re-parsing the format string.
+        # Years below 1000 are left to strftime, since its %Y does not zero pad them on every platform.
+        if date_time.year >= 1000:
+            if date_format == DateUtils.utc_format:
+                return DateUtils.__compose(date_time, " ")
+            if date_format == DateUtils.iso_8061_format:
+                utc_offset = DateUtils.__compose_utc_offset(date_time)
+                if utc_offset is not None:
+                    return DateUtils.__compose(date_time, "T") + utc_offset
+
         return datetime.strftime(date_time, date_format)
 
+    @staticmethod
+    def datetimes_to_strings(date_times: List[datetime], date_format: str = None):
+        if date_format is None:
+            date_format = DateUtils.utc_format
+
+        datetime_to_string = DateUtils.datetime_to_string
+        return [datetime_to_string(date_time, date_format) for date_time in date_times]
+
     @staticmethod
     def string_to_datetime(date_string: str, date_format: str = None):
         if date_format is None:
             date_format = DateUtils.utc_format
 
+        # Strings in the exact fixed-width layout of the known formats are parsed by the C-level ISO parser.
+        # Anything else, including the looser inputs strptime tolerates, goes through strptime.
+        try:
+            date_time = DateUtils.__parse_fixed_layout(date_string, date_format)
+            if date_time is not None:
+                return date_time
+        except ValueError:
+            pass
+
+        # Note: strptime already caches the compiled pattern of each format internally.
         return datetime.strptime(date_string, date_format)
+
+    @staticmethod
+    def __parse_fixed_layout(date_string: str, date_format: str):
+        if date_format == DateUtils.utc_format:
+            if len(date_string) == 26 and DateUtils.__has_fixed_layout(date_string, " "):
+                return datetime.fromisoformat(date_string)
+        elif date_format == DateUtils.iso_8061_format:
+            if len(date_string) == 31 and DateUtils.__has_fixed_layout(date_string, "T") \
+                    and date_string[26] in "+-" and date_string[27:31].isdigit() and date_string[29] < "6":
+                # fromisoformat only accepts the +HH:MM offset form on Python < 3.11
+                return datetime.fromisoformat(f"{date_string[:29]}:{date_string[29:]}")
+
+        return None
+
+    @staticmethod
+    def __has_fixed_layout(date_string: str, separator: str):
+        return date_string.isascii() and date_string[10] == separator \
+            and date_string[4] == date_string[7] == "-" and date_string[13] == date_string[16] == ":" \
+            and date_string[19] == "." and date_string[20:26].isdigit()
+
+    @staticmethod
+    def __compose(date_time: datetime, separator: str):
+        return (
+            f"{date_time.year}-{date_time.month:02}-{date_time.day:02}{separator}"
+            f"{date_time.hour:02}:{date_time.minute:02}:{date_time.second:02}.{date_time.microsecond:06}"
+        )
+
+    @staticmethod
+    def __compose_utc_offset(date_time: datetime):
+        offset = date_time.utcoffset()
+        if offset is None:
+            return ""
+
+        # Offsets with a seconds component have a longer %z representation, leave those to strftime.
+        offset_seconds = offset.days * 86400 + offset.seconds
+        if offset.microseconds != 0 or offset_seconds % 60 != 0:
+            return None
+
+        sign = "-" if offset_seconds < 0 else "+"
+        hours, minutes = divmod(abs(offset_seconds) // 60, 60)
+        return f"{sign}{hours:02}{minutes:02}"
@@ -14,13 +14,19 @@ class DictUtils:
             if target_node is None:
                 continue
 
+            # Walks the target in its own key order, so nested merges are queued deterministically.
+            # Keys missing from the source are collected and copied over in a single bulk insert.
+            missing_items = {}
             for target_key, target_value in target_node.items():
                 if target_key in source_node:
                     source_value = source_node[target_key]
                     if isinstance(source_value, dict) and isinstance(target_value, dict):
                         node_queue.append((source_value, target_value))
                 else:
-                    source_node[target_key] = target_value
+                    missing_items[target_key] = target_value
+
+            if len(missing_items) > 0:
+                source_node.update(missing_items)
 
         return source_dict
 
@@ -1,14 +1,15 @@
 import re
 
+_ACCESSOR_PATTERN = re.compile(r"[^\.\[\]]+|\[\d+\]")
+
 
 class DotSyntaxResolver:
     @staticmethod
     def get(parent: object, key: str):
         if key is not None:
-            accessors = re.findall(r"[^\.\[\]]+|\[\d+\]", key)
             deepest_value = parent
 
-            for accessor in accessors:
+            for accessor in DotSyntaxResolver.__tokenize(key):
                 if isinstance(deepest_value, (list, tuple)):
                     deepest_value = DotSyntaxResolver.__get_list_child(deepest_value, accessor)
                 else:
@@ -22,26 +23,37 @@ class DotSyntaxResolver:
         if not isinstance(parent, (dict, list)):
             raise TypeError("Can only set a value in a dict or list object")
 
-        accessors = re.findall(r"[^\.\[\]]+|\[\d+\]", key)
+        accessors = DotSyntaxResolver.__tokenize(key)
         deepest_value = parent
         
         for accessor_index in range(len(accessors) - 1):
             accessor = accessors[accessor_index]
             next_accessor = accessors[accessor_index + 1]
             
-            if isinstance(deepest_value, list):
+            # Exact type checks cover plain containers without an isinstance call, which is kept for subclasses
+            value_type = type(deepest_value)
+            if value_type is list or (value_type is not dict and isinstance(deepest_value, list)):
                 deepest_value = DotSyntaxResolver.__expand_list_child(deepest_value, accessor, next_accessor)
             else:
                 deepest_value = DotSyntaxResolver.__expand_dict_child(deepest_value, accessor, next_accessor)
 
         last_accessor = accessors[-1]
-        if isinstance(deepest_value, list):
+        value_type = type(deepest_value)
+        if value_type is list or (value_type is not dict and isinstance(deepest_value, list)):
             DotSyntaxResolver.__set_list_child(deepest_value, last_accessor, value)
         else:
             deepest_value[last_accessor] = value
 
         return parent
 
+    @staticmethod
+    def __tokenize(key: str):
+        # Keys without list indices are split in C, which is faster than running the accessor pattern.
+        if "[" not in key and "]" not in key:
+            return [accessor for accessor in key.split(".") if accessor]
+
+        return _ACCESSOR_PATTERN.findall(key)
+
     @staticmethod
     def __get_list_child(parent, accessor: str):
         parent_index = DotSyntaxResolver.__extract_list_index(accessor)
@@ -53,10 +65,11 @@ class DotSyntaxResolver:
 
     @staticmethod
     def __get_dict_child(parent, accessor: str):
-        if hasattr(parent, accessor):
-            child = getattr(parent, accessor)
-        elif isinstance(parent, dict) and accessor in parent:
+        # Dicts are checked first since a key probe is cheaper than a failed attribute lookup
+        if isinstance(parent, dict) and accessor in parent:
             child = parent[accessor]
+        elif hasattr(parent, accessor):
+            child = getattr(parent, accessor)
         else:
             raise KeyError("Accessor is not a property or key of the given parent")
 
@@ -1,30 +1,60 @@
+import codecs
+import functools
 import io
 import os
 from typing import Final
 
 from norman_utils_external.singleton import Singleton
 
+_HEADER_SIZE = 1024
+_MP3_TYPE = ("Audio", "mp3", "audio/mpeg", "mp3")
+_ZIP_TYPE = ("File", "bin", "application/octet-stream", "bin")  # `.pt` files have a zip header
+_PNG_TYPE = ("Image", "png", "image/png", "png")
+_JPG_TYPE = ("Image", "jpg", "image/jpeg", "jpg")
+_AAC_TYPE = ("Audio", "aac", "audio/aac", "aac")
+_WAV_TYPE = ("Audio", "wav", "audio/wav", "wav")
+_MP4_TYPE = ("Video", "mp4", "video/mp4", "mp4")
+
+# Each magic number maps a header prefix to its file type, with an optional (offset, marker) pair
+# that must also be present in the header for the prefix to match.
+_MAGIC_NUMBERS = (
+    (b"ID3", _MP3_TYPE, None),
+    (b"PK\x03\x04", _ZIP_TYPE, None),
+    (b"\x89PNG", _PNG_TYPE, None),
+    (b"\xff\xd8\xff", _JPG_TYPE, None),
+    (b"\xff\xf1", _AAC_TYPE, None),
+    (b"\xff\xf9", _AAC_TYPE, None),
+    (b"RIFF", _WAV_TYPE, (8, b"WAVE")),
+    (b"\x00\x00\x00", _MP4_TYPE, (4, b"ftyp")),
+)
+
 
 class FileUtils(metaclass=Singleton):
     def __init__(self):
-        self.__UTF8_BYTE_ORDER_MARKS: Final = ["efbbbf"]
-        self.__UTF16_BYTE_ORDER_MARKS: Final = ["feff", "fffe"]  # Big endian and little endian, respectively
+        self.__UTF8_BYTE_ORDER_MARKS: Final = (b"\xef\xbb\xbf",)
+        self.__UTF16_BYTE_ORDER_MARKS: Final = (b"\xfe\xff", b"\xff\xfe")  # Big endian and little endian, respectively
+
+        # Magic numbers indexed by their first byte, so a header is only compared against the few rules that can match it
+        self.__MAGIC_NUMBER_DISPATCH: Final = [[] for _ in range(256)]
+        for magic_number in _MAGIC_NUMBERS:
+            self.__MAGIC_NUMBER_DISPATCH[magic_number[0][0]].append(magic_number)
 
     @staticmethod
     def get_buffer_size(file_obj):
-        if hasattr(file_obj, "fileno"):
-            return os.fstat(file_obj.fileno()).st_size
+        if isinstance(file_obj, (str, os.PathLike)):
+            return os.path.getsize(file_obj)
+        # BytesIO is checked before fileno, since it exposes a fileno method that always raises
         if isinstance(file_obj, io.BytesIO):
             return file_obj.getbuffer().nbytes
+        if hasattr(file_obj, "fileno"):
+            return os.fstat(file_obj.fileno()).st_size
         raise ValueError("Unsupported file object or operation")
 
     def get_file_type(self, file_path: str):
         try:
-            with open(file_path, "rb") as file:
-                header = file.read(1024)
-                # Reading 1024 bytes (instead of 128 or less) to improve detection accuracy
-                # for unmarked UTF-8 files and formats lacking clear headers
-
+            # The modification time and size are part of the cache key, so edited files are re-classified
+            file_stat = os.stat(file_path)
+            file_type = self.__get_cached_file_type(file_path, file_stat.st_mtime_ns, file_stat.st_size)
         except IOError:
             return {
                 "data_modality": "File",
@@ -33,28 +63,32 @@ class FileUtils(metaclass=Singleton):
                 "file_extension": "bin",
                 "Content-Type": "application/octet-stream"
             }
-        return self.__get_file_type_from_header(header)
-
-    def __get_file_type_from_header(self, header: bytes):
-        hex_header = header.hex()
-
-        if hex_header.startswith("494433"):
-            data_modality, data_encoding, mime_type, file_extension = "Audio", "mp3", "audio/mpeg", "mp3"
-        elif hex_header.startswith("504b0304"):
-            data_modality, data_encoding, mime_type, file_extension = "File", "bin", "application/octet-stream", "bin"  # `.pt` files have a zip header
-        elif hex_header.startswith("89504e47"):
-            data_modality, data_encoding, mime_type, file_extension = "Image", "png", "image/png", "png"
-        elif hex_header.startswith("ffd8ff"):
-            data_modality, data_encoding, mime_type, file_extension = "Image", "jpg", "image/jpeg", "jpg"
-        elif hex_header.startswith("fff1") or hex_header.startswith("fff9"):
-            data_modality, data_encoding, mime_type, file_extension = "Audio", "aac", "audio/aac", "aac"
-        elif hex_header.startswith("52494646") and "57415645" in hex_header:
-            data_modality, data_encoding, mime_type, file_extension = "Audio", "wav", "audio/wav", "wav"
-        elif hex_header.startswith("000000") and "66747970" in hex_header:
-            data_modality, data_encoding, mime_type, file_extension = "Video", "mp4", "video/mp4", "mp4"
+
+        # Copy so that callers cannot alter the cached result
+        return dict(file_type)
+
+    def clear_file_type_cache(self):
+        self.__get_cached_file_type.cache_clear()
+
+    @functools.lru_cache(maxsize=1024)
+    def __get_cached_file_type(self, file_path: str, modification_time_ns: int, file_size: int):
+        with open(file_path, "rb") as file:
+            header = file.read(_HEADER_SIZE)
+            # Reading 1024 bytes (instead of 128 or less) to improve detection accuracy
+            # for unmarked UTF-8 files and formats lacking clear headers
+
+        # A header holding the whole file must end on a complete character to count as UTF-8
+        is_whole_file = len(header) < _HEADER_SIZE or len(header) >= file_size
+        return self.__get_file_type_from_header(header, is_whole_file)
+
+    def __get_file_type_from_header(self, header: bytes, is_whole_file: bool):
+        file_type = self.__match_magic_number(header)
+
+        if file_type is not None:
+            data_modality, data_encoding, mime_type, file_extension = file_type
         elif self.__is_utf16(header):
             data_modality, data_encoding, mime_type, file_extension = "Text", "utf16", "text/plain", "txt"
-        elif self.__is_utf8(header):
+        elif self.__is_utf8(header, is_whole_file):
             data_modality, data_encoding, mime_type, file_extension = "Text", "utf8", "text/plain", "txt"
         else:
             data_modality, data_encoding, mime_type, file_extension = "File", "bin", "application/octet-stream", "bin"
@@ -67,27 +101,51 @@ class FileUtils(metaclass=Singleton):
             "Content-Type": mime_type  # S3 relies on Content-Type for proper file handling.
         }
 
-    def __is_utf16(self, header: bytes):
-        hex_header = header.hex()
-        for bom in self.__UTF16_BYTE_ORDER_MARKS:
-            if hex_header.startswith(bom):
-                return True
+    def __match_magic_number(self, header: bytes):
+        if len(header) == 0:
+            return None
 
-        # Try to decode as UTF-16 (with BOM detection)
-        try:
-            header.decode("utf-16")
+        for prefix, file_type, marker in self.__MAGIC_NUMBER_DISPATCH[header[0]]:
+            if not header.startswith(prefix):
+                continue
+
+            if marker is None:
+                return file_type
+
+            marker_offset, marker_bytes = marker
+            if header.startswith(marker_bytes, marker_offset):
+                return file_type
+
+        return None
+
+    def __is_utf16(self, header: bytes):
+        if header.startswith(self.__UTF16_BYTE_ORDER_MARKS):
             return True
-        except Exception:
+
+        # Without a BOM, UTF-16 text in the Latin range has a zero byte at every other offset (odd for little endian,
+        # even for big endian). Decoding is not used as a signal, since almost any even-length buffer decodes as UTF-16.
+        code_unit_count = len(header) // 2
+        if code_unit_count == 0:
             return False
 
-    def __is_utf8(self, header: bytes):
-        for bom in self.__UTF8_BYTE_ORDER_MARKS:
-            if header.hex().startswith(bom):
-                return True
+        even_zero_count = header[0::2].count(0)
+        odd_zero_count = header[1::2].count(0)
+        high_zero_count, low_zero_count = max(even_zero_count, odd_zero_count), min(even_zero_count, odd_zero_count)
+
+        return high_zero_count * 10 > code_unit_count * 4 and low_zero_count * 20 < code_unit_count
+
+    def __is_utf8(self, header: bytes, is_whole_file: bool):
+        if header.startswith(self.__UTF8_BYTE_ORDER_MARKS):
+            return True
+
+        # ASCII is valid UTF-8, and the check is a single pass that does not allocate a str
+        if header.isascii():
+            return True
 
-        # Try to decode as UTF-8
+        # Try to decode as UTF-8. A header cut from a longer file may end in the middle of a multibyte sequence,
+        # so it is only treated as final when it is the whole file.
         try:
-            header.decode("utf-8")
+            codecs.utf_8_decode(header, "strict", is_whole_file)
             return True
         except UnicodeDecodeError:
             return False
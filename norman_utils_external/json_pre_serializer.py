@@ -1,115 +1,254 @@
+import types
+import weakref
 from datetime import datetime
 from enum import Enum
 
 from norman_utils_external.date_utils import DateUtils
 
 
-class JsonPreSerializer:
+def _copy_public_items(node: dict):
+    # Most dicts have no private keys, in which case a plain C-level copy is enough
+    for key in node:
+        if key.startswith("_"):
+            return {key: value for key, value in node.items() if not key.startswith("_")}
 
-    @staticmethod
-    def prepare_for_serialization(context_var):
-        # Create an id for the context var (using python id function, not the object id)
-        context_var_id = id(context_var)
+    return dict(node)
 
-        # Prevents altering context_var.
-        # Structured as a shallow key:value lookup to determine whether a given node is contained within context_car
-        node_lookup = {}
 
-        # Facilitates the BFS
-        traversal_stack = [(context_var, id(context_var))]
+def _copy_values(node):
+    return list(node)
 
-        # Prevents infinite recursion and reference loops
-        visited_element_ids = set()
 
-        # First breadth-first-search over the traversal stack to normalize and pre-serialize nodes.
-        while len(traversal_stack) > 0:
-            current_node, node_id = traversal_stack.pop()
-            if node_id in visited_element_ids:
-                continue
+def _keep(node):
+    return node
 
-            visited_element_ids.add(node_id)
 
-            # Normalize and shallow-copy current node. Child nodes will be normalized in following iterations (BFS)
-            child_nodes = JsonPreSerializer.shallow_normalize(current_node)
+def _enum_value(node: Enum):
+    return node.value
 
-            # Calculate an id for each node, and store as a list of tuples
-            stack_elements = JsonPreSerializer.create_stack_elements(child_nodes)
 
-            # Add filtered tuples to traversal stack for iteration
-            traversal_stack.extend(stack_elements)
+def _model_dump(node):
+    return node.model_dump()
 
-            # Add normalized child nodes to node lookup. Notice that the node_id is of the original node.
-            node_lookup[node_id] = child_nodes
 
-        # Restart the BFS
-        traversal_stack.append((context_var, id(context_var)))
-        visited_element_ids.clear()
+def _dict_method(node):
+    return node.dict()
 
-        # Second breadth-first-search over the traversal stack to update pointers to the normalized nodes from the first iteration.
-        while len(traversal_stack) > 0:
-            current_node, node_id = traversal_stack.pop()
-            if node_id in visited_element_ids:
-                continue
 
-            visited_element_ids.add(node_id)
+def _copy_public_attributes(node):
+    return _copy_public_items(node.__dict__)
+
+
+def _copy_public_item_pairs(node):
+    node_items = getattr(node, "__items__")
+    iterable = JsonPreSerializer.get_iterable(node_items)
+    return {key: value for key, value in iterable if not key.startswith("_")}
+
+
+def _format_datetime(node: datetime):
+    return DateUtils.datetime_to_string(node, DateUtils.iso_8061_format)
+
+
+# Exact types only, so that str/int based Enums and other subclasses are still normalized.
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# Normalizers for plain built-in types, looked up by exact type. Subclasses go through the full attribute probing.
+_BUILTIN_NORMALIZERS = {
+    dict: _copy_public_items,
+    list: _copy_values,
+    tuple: _copy_values,
+    set: _copy_values,
+    str: _keep,
+    int: _keep,
+    float: _keep,
+    bool: _keep,
+    type(None): _keep,
+}
+
+# Normalizers for all other classes, resolved from the class and reused for all of its instances.
+# Weakly keyed, so that classes created at runtime (e.g. dynamic models, namedtuple factories) can still be collected.
+_CLASS_NORMALIZERS = weakref.WeakKeyDictionary()
 
-            # Get pre-serialized node from node lookup, using the node_id of the original node
-            pre_serialized_node = node_lookup[node_id]
+# Cached for classes whose instances can answer the normalizer checks differently, e.g. `__getattr__` proxies.
+_RESOLVE_PER_INSTANCE = object()
+_MISSING = object()
 
-            # Update refs for dicts to point to the pre-serialized children instead of the original children.
-            if isinstance(pre_serialized_node, dict):
-                node_children = {key: node_lookup[id(value)] for key, value in pre_serialized_node.items()}
+# Attributes probed by the normalizer checks that an instance can also provide through its own `__dict__`.
+_INSTANCE_PROBED_ATTRIBUTES = frozenset(("model_dump", "dict", "__slots__", "__items__"))
 
-                stack_elements = [(value, id(value)) for value in pre_serialized_node.values()]
-                traversal_stack.extend(stack_elements)
+_OBJECT_CLASS = vars(object)["__class__"]
+# Weakref proxies forward attribute access in C, unlike other C types that expose a `__getattribute__` slot.
+_FORWARDING_PROXY_TYPES = (weakref.ProxyType, weakref.CallableProxyType)
 
-                pre_serialized_node.clear()
-                pre_serialized_node.update(node_children)
 
-            # Update refs for other collections to point to the pre-serialized children instead of the original children.
-            elif isinstance(pre_serialized_node, list):
-                node_children = [node_lookup[id(value)] for value in pre_serialized_node]
+def _find_class_attribute(node_type: type, name: str):
+    # Looks the attribute up along the MRO the way instance access does, without the instance `__dict__`
+    for base in node_type.__mro__:
+        base_attributes = vars(base)
+        if name in base_attributes:
+            return base_attributes[name]
 
-                stack_elements = [(value, id(value)) for value in pre_serialized_node]
-                traversal_stack.extend(stack_elements)
+    return _MISSING
 
-                pre_serialized_node.clear()
-                pre_serialized_node.extend(node_children)
+
+def _overrides_attribute_access(node_type: type):
+    # C-level `__getattribute__` slots are generic attribute access, Python-level ones can answer anything.
+    if node_type in _FORWARDING_PROXY_TYPES:
+        return True
+
+    getattribute = _find_class_attribute(node_type, "__getattribute__")
+    return not isinstance(getattribute, types.WrapperDescriptorType) \
+        or _find_class_attribute(node_type, "__class__") is not _OBJECT_CLASS
+
+
+def _is_static_attribute(attribute):
+    # Plain values, functions and static/class methods resolve the same for every instance. Other descriptors,
+    # such as properties or unset slots, can differ per instance.
+    if isinstance(attribute, (staticmethod, classmethod)) or callable(attribute):
+        return True
+
+    return not hasattr(type(attribute), "__get__")
+
+
+class JsonPreSerializer:
+
+    @staticmethod
+    def prepare_for_serialization(context_var):
+        # Maps the id of every visited original node to the node and its normalized copy.
+        # Prevents infinite recursion and reference loops, and keeps shared references shared after normalization.
+        # The original node is kept alongside its copy so that its id cannot be reused while the traversal runs.
+        normalized_nodes = {}
 
         # Return normalized node for use in any serialization library
-        return node_lookup[context_var_id]
+        return JsonPreSerializer.__normalize(context_var, normalized_nodes)
+
+    @staticmethod
+    def __normalize(node, normalized_nodes):
+        # Work stack of (normalized container, key or index) slots that still hold an original child.
+        # An explicit stack instead of recursion, so that arbitrarily deep nesting cannot exhaust the call stack.
+        root = [node]
+        pending_slots = [(root, 0)]
+
+        while len(pending_slots) > 0:
+            container, key = pending_slots.pop()
+            child = container[key]
+
+            # Plain primitives cannot form reference loops and normalize to themselves, so they skip the memo entirely.
+            if type(child) in _PRIMITIVE_TYPES:
+                continue
+
+            child_id = id(child)
+            if child_id in normalized_nodes:
+                container[key] = normalized_nodes[child_id][1]
+                continue
+
+            # Normalize and shallow-copy the child. The copy is registered before its own children are normalized,
+            # so reference loops resolve to it instead of being traversed forever.
+            normalized_child = JsonPreSerializer.shallow_normalize(child)
+            normalized_nodes[child_id] = (child, normalized_child)
+            container[key] = normalized_child
+
+            # Slots are pushed in reverse so they are visited in their original order.
+            if isinstance(normalized_child, dict):
+                pending_slots.extend((normalized_child, child_key) for child_key in reversed(list(normalized_child)))
+            elif isinstance(normalized_child, list):
+                pending_slots.extend((normalized_child, index) for index in range(len(normalized_child) - 1, -1, -1))
+
+        return root[0]
 
     @staticmethod
     def shallow_normalize(node):
+        builtin_normalizer = _BUILTIN_NORMALIZERS.get(type(node))
+        if builtin_normalizer is not None:
+            return builtin_normalizer(node)
+
+        # Checked per instance, since the marker may be set on individual objects.
         if hasattr(node, "__sensitive__"):
             return "<redacted>"
-        elif isinstance(node, Enum):
-            return node.value
+
+        node_type = type(node)
+        class_normalizer = _CLASS_NORMALIZERS.get(node_type)
+        if class_normalizer is None:
+            class_normalizer = JsonPreSerializer.__resolve_class_normalizer(node_type)
+            _CLASS_NORMALIZERS[node_type] = class_normalizer
+
+        # Instances shadowing or adding a probed attribute are resolved on their own, like per-instance classes.
+        if class_normalizer is _RESOLVE_PER_INSTANCE or \
+                not _INSTANCE_PROBED_ATTRIBUTES.isdisjoint(getattr(node, "__dict__", ())):
+            class_normalizer = JsonPreSerializer.__resolve_instance_normalizer(node)
+
+        return class_normalizer(node)
+
+    @staticmethod
+    def __resolve_class_normalizer(node_type: type):
+        # Mirrors __resolve_instance_normalizer on the class alone, and gives up on any check an instance could
+        # answer differently. A `__getattr__` hook only matters for attributes the class does not define itself.
+        if _overrides_attribute_access(node_type):
+            return _RESOLVE_PER_INSTANCE
+        has_getattr_hook = _find_class_attribute(node_type, "__getattr__") is not _MISSING
+
+        if issubclass(node_type, Enum):
+            return _enum_value
+        elif issubclass(node_type, dict):
+            return _copy_public_items
+        elif issubclass(node_type, (list, tuple, set)):
+            return _copy_values
+
+        for method_name, method_normalizer in (("model_dump", _model_dump), ("dict", _dict_method)):
+            method = _find_class_attribute(node_type, method_name)
+            if method is _MISSING:
+                if has_getattr_hook:
+                    return _RESOLVE_PER_INSTANCE
+            elif not _is_static_attribute(method):
+                return _RESOLVE_PER_INSTANCE
+            elif isinstance(method, (staticmethod, classmethod)) or callable(method):
+                return method_normalizer
+
+        for attribute_name in ("__slots__", "__dict__", "__items__"):
+            attribute = _find_class_attribute(node_type, attribute_name)
+            if attribute is _MISSING:
+                if has_getattr_hook:
+                    return _RESOLVE_PER_INSTANCE
+                continue
+            if attribute_name == "__dict__":
+                # The instance `__dict__` descriptor is always present once defined
+                return _copy_public_attributes
+            if not _is_static_attribute(attribute):
+                return _RESOLVE_PER_INSTANCE
+
+            if attribute_name == "__slots__":
+                public_slots = [key for key in attribute if not key.startswith("_")]
+                return lambda slotted_node: {key: getattr(slotted_node, key) for key in public_slots}
+            return _copy_public_item_pairs
+
+        if issubclass(node_type, datetime):
+            return _format_datetime
+        else:
+            return _keep
+
+    @staticmethod
+    def __resolve_instance_normalizer(node):
+        if isinstance(node, Enum):
+            return _enum_value
         elif isinstance(node, dict):
-            return {key: value for key, value in node.items() if not key.startswith("_")}
+            return _copy_public_items
         elif isinstance(node, (list, tuple, set)):
-            return [value for value in node]
+            return _copy_values
         elif hasattr(node, "model_dump") and callable(getattr(node, "model_dump")):
-            dict_representation = node.model_dump()
-            return dict_representation
+            return _model_dump
         elif hasattr(node, "dict") and callable(getattr(node, "dict")):
-            dict_representation = node.dict()
-            return dict_representation
+            return _dict_method
         elif hasattr(node, "__slots__"):
-            dict_representation = {key: getattr(node, key) for key in node.__slots__ if not key.startswith("_")}
-            return dict_representation
+            public_slots = [key for key in node.__slots__ if not key.startswith("_")]
+            return lambda slotted_node: {key: getattr(slotted_node, key) for key in public_slots}
         elif hasattr(node, "__dict__"):
-            dict_representation = {key: value for key, value in node.__dict__.items() if not key.startswith("_")}
-            return dict_representation
+            return _copy_public_attributes
         elif hasattr(node, "__items__"):
-            node_items = getattr(node, "__items__")
-            iterable = JsonPreSerializer.get_iterable(node_items)
-            dict_representation = {key: value for key, value in iterable if not key.startswith("_")}
-            return dict_representation
+            return _copy_public_item_pairs
         elif isinstance(node, datetime):
-            return DateUtils.datetime_to_string(node, DateUtils.iso_8061_format)
+            return _format_datetime
         else:
-            return node
+            return _keep
 
     @staticmethod
     def get_iterable(variable):
@@ -119,15 +258,3 @@ class JsonPreSerializer:
             return variable.items()
         else:
             return variable
-
-    @staticmethod
-    def create_stack_elements(node_collection):
-        if isinstance(node_collection, dict):
-            stack_elements = [(node, id(node)) for node in node_collection.values()]
-            return stack_elements
-        elif isinstance(node_collection, (list, tuple, set)):
-            stack_elements = [(node, id(node)) for node in node_collection]
-            return stack_elements
-        else:
-            stack_elements = [(node_collection, id(node_collection))]
-            return stack_elements
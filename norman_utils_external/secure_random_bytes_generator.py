@@ -1,18 +1,134 @@
+import asyncio
 import os
+import threading
+import weakref
+from collections import deque
 
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 from norman_utils_external.singleton import Singleton
 
+# `update_into` requires room for one extra cipher block beyond the payload.
+_UPDATE_INTO_SLACK = 15
+_INITIAL_BUFFER_SIZE = 4096
+_MAX_CACHED_ZERO_BUFFER_SIZE = 1 << 20
+_MAX_ASYNC_BATCH_SIZE = 64 * 1024
+# Well below the 256 GiB at which ChaCha20's 32-bit block counter wraps.
+_REKEY_INTERVAL = 1 << 34
+
 
 class SecureRandomBytesGenerator(metaclass=Singleton):
     def __init__(self):
+        # The cipher context may not be used by two threads at once, and the rekey accounting must not interleave.
+        self._stream_lock = threading.Lock()
+        self.__rekey()
+
+        self._zero_buffer = bytes(_INITIAL_BUFFER_SIZE)
+
+        self._pending_requests = weakref.WeakKeyDictionary()
+        self._pending_requests_lock = threading.Lock()
+
+    def next(self, number_of_bytes: int):
+        self.__validate_size(number_of_bytes)
+
+        # `update` returns a fresh bytes object, so concurrent callers never share output storage.
+        zeros = self.__zeros(number_of_bytes)
+        with self._stream_lock:
+            return self.__reserve(number_of_bytes).update(zeros)
+
+    def fill_into(self, buffer, number_of_bytes: int = None):
+        # Writes random bytes directly into a caller-owned writable buffer and returns the number of bytes written.
+        # Per `update_into`'s contract the buffer must be at least `number_of_bytes + 15` bytes long;
+        # by default everything but that slack is filled.
+        if number_of_bytes is None:
+            if len(buffer) < _UPDATE_INTO_SLACK:
+                raise ValueError(f"buffer must be at least {_UPDATE_INTO_SLACK} bytes long")
+            number_of_bytes = len(buffer) - _UPDATE_INTO_SLACK
+        self.__validate_size(number_of_bytes)
+
+        zeros = self.__zeros(number_of_bytes)
+        with self._stream_lock:
+            return self.__reserve(number_of_bytes).update_into(zeros, buffer)
+
+    def next_async(self, number_of_bytes: int):
+        # Requests made within the same event loop iteration are served by a single cipher update.
+        # Each running loop has its own queue and flush, so futures are only ever resolved on their own loop.
+        self.__validate_size(number_of_bytes)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        with self._pending_requests_lock:
+            pending_requests = self._pending_requests.get(loop)
+            if pending_requests is None:
+                pending_requests = deque()
+                self._pending_requests[loop] = pending_requests
+                loop.call_soon(self.__flush_pending_requests, loop)
+            pending_requests.append((number_of_bytes, future))
+
+        return future
+
+    def __flush_pending_requests(self, loop):
+        # Requests made after the queue is taken start a new queue, with its own flush.
+        with self._pending_requests_lock:
+            pending_requests = self._pending_requests.pop(loop, None)
+        if pending_requests is None:
+            return
+
+        while len(pending_requests) > 0:
+            batch = []
+            batch_size = 0
+            while len(pending_requests) > 0:
+                number_of_bytes = pending_requests[0][0]
+                if len(batch) > 0 and batch_size + number_of_bytes > _MAX_ASYNC_BATCH_SIZE:
+                    break
+
+                batch.append(pending_requests.popleft())
+                batch_size += number_of_bytes
+
+            random_bytes = self.next(batch_size)
+            offset = 0
+            for number_of_bytes, future in batch:
+                if not future.done():
+                    future.set_result(random_bytes[offset:offset + number_of_bytes])
+                offset += number_of_bytes
+
+    def __validate_size(self, number_of_bytes: int):
+        if number_of_bytes < 0:
+            raise ValueError("number of bytes must not be negative")
+
+    def __reserve(self, number_of_bytes: int):
+        if self._bytes_since_rekey + number_of_bytes > _REKEY_INTERVAL:
+            self.__rekey()
+
+        self._bytes_since_rekey += number_of_bytes
+        return self._stream
+
+    def __zeros(self, number_of_bytes: int):
+        # The cached zero block is immutable and only read, so it is safe to share between threads.
+        # Large requests get a one-off block, so a single big call does not pin its size for the process lifetime.
+        if number_of_bytes > _MAX_CACHED_ZERO_BUFFER_SIZE:
+            return bytes(number_of_bytes)
+
+        if number_of_bytes > len(self._zero_buffer):
+            self._zero_buffer = bytes(number_of_bytes)
+
+        return memoryview(self._zero_buffer)[:number_of_bytes]
+
+    def __rekey(self):
         self.seed_key = os.urandom(32)
         self.seed_nonce = os.urandom(16)
 
-        algorithm = algorithms.ChaCha20(self.seed_key, self.seed_nonce)
-        cipher = Cipher(algorithm, mode=None, backend=default_backend())
+        backend = default_backend()
+        algorithm, mode = self.__select_cipher(backend)
+        cipher = Cipher(algorithm, mode=mode, backend=backend)
         self._stream = cipher.encryptor()
+        self._bytes_since_rekey = 0
 
-    def next(self, number_of_bytes: int):
-        return self._stream.update(b'\x00' * number_of_bytes)
+    def __select_cipher(self, backend):
+        # AES-CTR is dispatched by OpenSSL to AES-NI/VAES where available, which outpaces ChaCha20 on x86.
+        algorithm = algorithms.AES(self.seed_key[:16])
+        mode = modes.CTR(self.seed_nonce[:16])
+        if backend.cipher_supported(algorithm, mode):
+            return algorithm, mode
+
+        return algorithms.ChaCha20(self.seed_key, self.seed_nonce), None
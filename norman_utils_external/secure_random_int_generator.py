@@ -1,3 +1,5 @@
+import threading
+
 from norman_utils_external.secure_random_bytes_generator import SecureRandomBytesGenerator
 
 
@@ -13,15 +15,49 @@ class SecureRandomIntGenerator:
         self.range_size = upper_bound - lower_bound + 1
 
         self.bits_needed = self.range_size.bit_length()
+
+        # Power-of-two ranges are sampled by masking random bits, so every draw is accepted.
+        self._is_power_of_two = (self.range_size & (self.range_size - 1)) == 0
+        self._mask = self.range_size - 1
+        if self._is_power_of_two:
+            # Values in [0, 2^k) only need k bits
+            self.bits_needed -= 1
+
         self.bytes_needed = (self.bits_needed + 7) // 8
         self.max_value = 1 << (self.bytes_needed * 8)
 
         self.rejection_threshold = self.max_value - (self.max_value % self.range_size)
 
+        # Entropy is drawn in blocks and sliced per value, which amortizes the cipher call over many values
+        self._pool = b""
+        self._pool_position = 0
+        self._pool_size = max(64, 64 * self.bytes_needed)
+        self._pool_lock = threading.Lock()
+
     def generate(self):
+        if self._is_power_of_two:
+            return self.lower_bound + (self.__next_random_value() & self._mask)
+
         while True:
-            random_bytes = self.entropy_source.next(self.bytes_needed)
-            value = int.from_bytes(random_bytes, byteorder="big")
+            value = self.__next_random_value()
 
             if value < self.rejection_threshold:
                 return self.lower_bound + (value % self.range_size)
+
+    def __next_random_value(self):
+        with self._pool_lock:
+            if self._pool_position + self.bytes_needed > len(self._pool):
+                self._pool = self.entropy_source.next(self._pool_size)
+                self._pool_position = 0
+
+            pool = self._pool
+            position = self._pool_position
+            self._pool_position += self.bytes_needed
+
+        # Small values are read straight from the pool, skipping the slice and the int.from_bytes call
+        if self.bytes_needed == 1:
+            return pool[position]
+        if self.bytes_needed == 2:
+            return (pool[position] << 8) | pool[position + 1]
+
+        return int.from_bytes(pool[position:position + self.bytes_needed], byteorder="big")
@@ -1,7 +1,15 @@
 import asyncio
-from typing import Union, Iterable, AsyncIterable, TypeVar, Callable, AsyncGenerator, Protocol, Any, Literal, overload
+import threading
+from collections import deque
+from typing import Union, Iterable, Iterator, AsyncIterable, TypeVar, Callable, AsyncGenerator, Protocol, Any, Literal, Optional, overload
 
 T = TypeVar('T')
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+INITIAL_ADAPTIVE_CHUNK_SIZE = 64 * 1024
+# Read buffers of the zero_copy path are reused across streams instead of being allocated per stream
+_BUFFER_POOL = deque(maxlen=64)
+_BUFFER_POOL_LOCK = threading.Lock()
+_MAX_POOLED_BUFFER_SIZE = DEFAULT_CHUNK_SIZE
 Processor = Union[Callable[[bytes], Any], Callable[[bytes], T]]
 
 class AsyncBufferedReader(Protocol):
@@ -13,33 +21,325 @@ class BufferedReader(Protocol):
 
 class StreamingUtils:
     @staticmethod
-    async def chain_streams(*streams: Union[Iterable[bytes], AsyncIterable[bytes]]):
+    async def chain_streams(*streams: Union[Iterable[bytes], AsyncIterable[bytes]], coalesce_to: int = None):
+        classified_streams = [(hasattr(stream, "__aiter__"), stream) for stream in streams]
+
+        if coalesce_to is None:
+            for is_async, stream in classified_streams:
+                if is_async:
+                    async for chunk in stream:
+                        yield chunk
+                else:
+                    for chunk in stream:
+                        yield chunk
+            return
+
+        # Accumulate small chunks and yield them once the buffer reaches `coalesce_to` bytes
+        buffer = bytearray()
+        for is_async, stream in classified_streams:
+            if is_async:
+                async for chunk in stream:
+                    buffer.extend(chunk)
+                    if len(buffer) >= coalesce_to:
+                        yield bytes(buffer)
+                        buffer.clear()
+            else:
+                for chunk in stream:
+                    buffer.extend(chunk)
+                    if len(buffer) >= coalesce_to:
+                        yield bytes(buffer)
+                        buffer.clear()
+
+        if len(buffer) > 0:
+            yield bytes(buffer)
+
+    @staticmethod
+    async def collect_streams(*streams: Union[Iterable[bytes], AsyncIterable[bytes]]) -> bytes:
+        buffer = bytearray()
+        await StreamingUtils.collect_streams_into(buffer, *streams)
+        return bytes(buffer)
+
+    @staticmethod
+    async def collect_streams_into(buffer: bytearray, *streams: Union[Iterable[bytes], AsyncIterable[bytes]]) -> bytearray:
+        # Appends every chunk to the caller-owned buffer, without materializing a list of chunks first
+        extend = buffer.extend
         for stream in streams:
             if hasattr(stream, "__aiter__"):
                 async for chunk in stream:
-                    yield chunk
+                    extend(chunk)
             else:
                 for chunk in stream:
-                    yield chunk
+                    extend(chunk)
+
+        return buffer
 
     @staticmethod
-    async def process_read_stream(
+    def process_read_stream(
             file_stream: Union[AsyncBufferedReader, BufferedReader] ,
-            processor: Processor[T],
-            chunk_size: int,
-            yield_processed: bool = True
+            processor: Optional[Processor[T]],
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            yield_processed: bool = True,
+            adaptive_chunk_size: bool = False,
+            zero_copy: bool = False,
+            min_yield_size: int = 0
     ) -> AsyncGenerator[Union[bytes, T], None]:
+        # Picks the read loop matching the given options once, and returns that async generator directly
+        if chunk_size is None or chunk_size <= 0:
+            chunk_size = DEFAULT_CHUNK_SIZE
+
+        if min_yield_size > 0:
+            # Consecutive byte outputs are merged until they reach min_yield_size. Order is preserved.
+            outputs = StreamingUtils.process_read_stream(
+                file_stream, processor, chunk_size, yield_processed, adaptive_chunk_size, zero_copy
+            )
+            return StreamingUtils.__coalesce_outputs(outputs, min_yield_size)
+
+        is_async = asyncio.iscoroutinefunction(file_stream.read)
+
+        if adaptive_chunk_size or zero_copy:
+            if processor is None:
+                processor, yield_processed = StreamingUtils.__ignore_chunk, False
+            return StreamingUtils.__process_tuned_read_stream(
+                file_stream, processor, chunk_size, yield_processed, adaptive_chunk_size, zero_copy, is_async
+            )
+
+        read_stream = StreamingUtils.build_read_stream(is_async, processor is not None, yield_processed)
+        return read_stream(file_stream, processor, chunk_size)
+
+    @staticmethod
+    def iter_read_stream(
+            file_stream: BufferedReader,
+            processor: Optional[Processor[T]],
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            yield_processed: bool = True
+    ) -> Iterator[Union[bytes, T]]:
+        # Synchronous counterpart of process_read_stream for sync readers and consumers, with no await per chunk.
+        # Does not accept an AsyncBufferedReader. Validates eagerly, and returns a generator specialized for the arguments.
+        if asyncio.iscoroutinefunction(file_stream.read):
+            raise TypeError("iter_read_stream requires a synchronous file stream")
+        if chunk_size is None or chunk_size <= 0:
+            chunk_size = DEFAULT_CHUNK_SIZE
+
+        iter_read_stream = StreamingUtils.__build_iter_read_stream(processor is not None, yield_processed)
+        return iter_read_stream(file_stream, processor, chunk_size)
+
+    @staticmethod
+    def __build_iter_read_stream(has_processor: bool, yield_processed: bool):
+        # Synchronous counterpart of build_read_stream
+        if not has_processor:
+            return StreamingUtils.__iter_chunks
+        if yield_processed:
+            return StreamingUtils.__iter_processed_chunks
+        return StreamingUtils.__iter_inspected_chunks
+
+    @staticmethod
+    def __iter_chunks(file_stream: BufferedReader, processor: None, chunk_size: int):
+        read = file_stream.read
         while True:
-            if asyncio.iscoroutinefunction(file_stream.read):
-                chunk = await file_stream.read(chunk_size)
-            else:
-                chunk = file_stream.read(chunk_size)
+            chunk = read(chunk_size)
+            if chunk is None or len(chunk) == 0:
+                break
+            yield chunk
+
+    @staticmethod
+    def __iter_processed_chunks(file_stream: BufferedReader, processor: Processor[T], chunk_size: int):
+        read = file_stream.read
+        while True:
+            chunk = read(chunk_size)
+            if chunk is None or len(chunk) == 0:
+                break
+            yield processor(chunk)
 
+    @staticmethod
+    def __iter_inspected_chunks(file_stream: BufferedReader, processor: Processor[T], chunk_size: int):
+        read = file_stream.read
+        while True:
+            chunk = read(chunk_size)
+            if chunk is None or len(chunk) == 0:
+                break
+            processor(chunk)
+            yield chunk
+
+    @staticmethod
+    def build_read_stream(is_async: bool, has_processor: bool, yield_processed: bool):
+        # Returns a read loop specialized for the given configuration, taking (file_stream, processor, chunk_size).
+        # Each variant has no configuration branches inside its loop.
+        if not has_processor:
+            return StreamingUtils.__read_async_chunks if is_async else StreamingUtils.__read_sync_chunks
+        if yield_processed:
+            return StreamingUtils.__process_async_chunks if is_async else StreamingUtils.__process_sync_chunks
+        return StreamingUtils.__inspect_async_chunks if is_async else StreamingUtils.__inspect_sync_chunks
+
+    @staticmethod
+    async def __read_async_chunks(file_stream: AsyncBufferedReader, processor: None, chunk_size: int):
+        read = file_stream.read
+        while True:
+            chunk = await read(chunk_size)
             if chunk is None or len(chunk) == 0:
                 break
-            processed = processor(chunk)
+            yield chunk
 
-            if yield_processed:
-                yield processed
+    @staticmethod
+    async def __read_sync_chunks(file_stream: BufferedReader, processor: None, chunk_size: int):
+        read = file_stream.read
+        while True:
+            chunk = read(chunk_size)
+            if chunk is None or len(chunk) == 0:
+                break
+            yield chunk
+
+    @staticmethod
+    async def __process_async_chunks(file_stream: AsyncBufferedReader, processor: Processor[T], chunk_size: int):
+        read = file_stream.read
+        while True:
+            chunk = await read(chunk_size)
+            if chunk is None or len(chunk) == 0:
+                break
+            yield processor(chunk)
+
+    @staticmethod
+    async def __process_sync_chunks(file_stream: BufferedReader, processor: Processor[T], chunk_size: int):
+        read = file_stream.read
+        while True:
+            chunk = read(chunk_size)
+            if chunk is None or len(chunk) == 0:
+                break
+            yield processor(chunk)
+
+    @staticmethod
+    async def __inspect_async_chunks(file_stream: AsyncBufferedReader, processor: Processor[T], chunk_size: int):
+        read = file_stream.read
+        while True:
+            chunk = await read(chunk_size)
+            if chunk is None or len(chunk) == 0:
+                break
+            processor(chunk)
+            yield chunk
+
+    @staticmethod
+    async def __inspect_sync_chunks(file_stream: BufferedReader, processor: Processor[T], chunk_size: int):
+        read = file_stream.read
+        while True:
+            chunk = read(chunk_size)
+            if chunk is None or len(chunk) == 0:
+                break
+            processor(chunk)
+            yield chunk
+
+    @staticmethod
+    def __ignore_chunk(chunk):
+        return None
+
+    @staticmethod
+    async def __process_tuned_read_stream(
+            file_stream: Union[AsyncBufferedReader, BufferedReader],
+            processor: Processor[T],
+            chunk_size: int,
+            yield_processed: bool,
+            adaptive_chunk_size: bool,
+            zero_copy: bool,
+            is_async: bool
+    ):
+        # With adaptive_chunk_size, reads start small and double after every full read, capped at chunk_size.
+        # A short read resets the size. Otherwise every read requests exactly chunk_size bytes.
+        initial_read_size = min(chunk_size, INITIAL_ADAPTIVE_CHUNK_SIZE) if adaptive_chunk_size else chunk_size
+        read_size = initial_read_size
+        read = file_stream.read
+
+        if is_async:
+            while True:
+                chunk = await read(read_size)
+                if chunk is None or len(chunk) == 0:
+                    break
+                processed = processor(chunk)
+
+                if yield_processed:
+                    yield processed
+                else:
+                    yield chunk
+
+                if adaptive_chunk_size:
+                    read_size = min(chunk_size, read_size * 2) if len(chunk) >= read_size else initial_read_size
+        elif zero_copy and hasattr(file_stream, "readinto"):
+            # Chunks are read into one reused buffer and handed to the processor as memoryviews, which are only valid
+            # until the next chunk is read or the stream is closed. The buffer then goes back to the pool, where another
+            # stream may overwrite it. Processors must copy anything they keep. Yielded raw chunks are copied out.
+            readinto = file_stream.readinto
+            pooled_buffer = StreamingUtils.__rent_buffer(chunk_size)
+            buffer = memoryview(pooled_buffer)
+
+            try:
+                while True:
+                    chunk_length = readinto(buffer[:read_size])
+                    if not chunk_length:
+                        break
+                    chunk = buffer[:chunk_length]
+                    processed = processor(chunk)
+
+                    if yield_processed:
+                        yield processed
+                    else:
+                        yield bytes(chunk)
+
+                    if adaptive_chunk_size:
+                        read_size = min(chunk_size, read_size * 2) if chunk_length >= read_size else initial_read_size
+            finally:
+                buffer.release()
+                StreamingUtils.__return_buffer(pooled_buffer)
+        else:
+            while True:
+                chunk = read(read_size)
+                if chunk is None or len(chunk) == 0:
+                    break
+                processed = processor(chunk)
+
+                if yield_processed:
+                    yield processed
+                else:
+                    yield chunk
+
+                if adaptive_chunk_size:
+                    read_size = min(chunk_size, read_size * 2) if len(chunk) >= read_size else initial_read_size
+
+    @staticmethod
+    def __rent_buffer(size: int) -> bytearray:
+        # Takes the first pooled buffer that is large enough, and leaves smaller ones for smaller chunk sizes
+        if size <= _MAX_POOLED_BUFFER_SIZE:
+            with _BUFFER_POOL_LOCK:
+                for index, buffer in enumerate(_BUFFER_POOL):
+                    if len(buffer) >= size:
+                        del _BUFFER_POOL[index]
+                        return buffer
+
+        return bytearray(size)
+
+    @staticmethod
+    def __return_buffer(buffer: bytearray):
+        # Buffers above the cap are dropped, so one stream with a huge chunk_size does not pin it for the process lifetime
+        if len(buffer) > _MAX_POOLED_BUFFER_SIZE:
+            return
+
+        with _BUFFER_POOL_LOCK:
+            _BUFFER_POOL.append(buffer)
+
+    @staticmethod
+    async def __coalesce_outputs(outputs: AsyncIterable[Any], min_yield_size: int):
+        buffer = bytearray()
+
+        async for output in outputs:
+            if not isinstance(output, (bytes, bytearray, memoryview)):
+                # Non-bytes outputs cannot be merged, flush what was gathered so far to keep the order
+                if len(buffer) > 0:
+                    yield bytes(buffer)
+                    buffer.clear()
+                yield output
+            elif len(buffer) == 0 and len(output) >= min_yield_size:
+                yield output
             else:
-                yield chunk
+                buffer.extend(output)
+                if len(buffer) >= min_yield_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+
+        if len(buffer) > 0:
+            yield bytes(buffer)